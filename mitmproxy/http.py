@@ -1,8 +1,10 @@
 import cgi
+import copy
 
 from mitmproxy import flow
 
 from mitmproxy.net import http
+from mitmproxy.utils import strutils
 from mitmproxy import version
 from mitmproxy.net import tcp
 from mitmproxy import connections  # noqa
@@ -61,24 +63,35 @@ class HTTPRequest(http.Request):
         self.is_replay = state.pop("is_replay")
         super().set_state(state)
 
+    @classmethod
+    def from_state(cls, state):
+        is_replay = state.pop("is_replay")
+        req = super().from_state(state)
+        req.is_replay = is_replay
+        req.stream = None
+        return req
+
+    def copy(self):
+        # The copy is treated as a brand new exchange: it is not streamed.
+        req = super().copy()
+        req.stream = None
+        return req
+
     @classmethod
     def wrap(self, request):
         """
         Wraps an existing :py:class:`mitmproxy.net.http.Request`.
         """
-        req = HTTPRequest(
-            first_line_format=request.data.first_line_format,
-            method=request.data.method,
-            scheme=request.data.scheme,
-            host=request.data.host,
-            port=request.data.port,
-            path=request.data.path,
-            http_version=request.data.http_version,
-            headers=request.data.headers,
-            content=request.data.content,
-            timestamp_start=request.data.timestamp_start,
-            timestamp_end=request.data.timestamp_end,
-        )
+        # A fresh data container with the same fields is all the
+        # constructor round-trip would have produced. Headers are the one
+        # field callers assign loosely, so coerce them like the
+        # constructor does.
+        req = HTTPRequest.__new__(HTTPRequest)
+        req.data = copy.copy(request.data)
+        if not isinstance(req.data.headers, http.Headers):
+            req.data.headers = http.Headers(req.data.headers)
+        req.is_replay = False
+        req.stream = None
         return req
 
     def __hash__(self):
@@ -119,20 +132,32 @@ class HTTPResponse(http.Response):
         self.is_replay = is_replay
         self.stream = None
 
+    @classmethod
+    def from_state(cls, state):
+        resp = super().from_state(state)
+        resp.is_replay = False
+        resp.stream = None
+        return resp
+
+    def copy(self):
+        # The copy is treated as a brand new exchange: it is neither
+        # streamed nor a replay.
+        resp = super().copy()
+        resp.is_replay = False
+        resp.stream = None
+        return resp
+
     @classmethod
     def wrap(self, response):
         """
         Wraps an existing :py:class:`mitmproxy.net.http.Response`.
         """
-        resp = HTTPResponse(
-            http_version=response.data.http_version,
-            status_code=response.data.status_code,
-            reason=response.data.reason,
-            headers=response.data.headers,
-            content=response.data.content,
-            timestamp_start=response.data.timestamp_start,
-            timestamp_end=response.data.timestamp_end,
-        )
+        resp = HTTPResponse.__new__(HTTPResponse)
+        resp.data = copy.copy(response.data)
+        if not isinstance(resp.data.headers, http.Headers):
+            resp.data.headers = http.Headers(resp.data.headers)
+        resp.is_replay = False
+        resp.stream = None
         return resp
 
 
@@ -171,12 +196,13 @@ class HTTPFlow(flow.Flow):
     )
 
     def __repr__(self):
-        s = "<HTTPFlow"
+        parts = ["<HTTPFlow"]
         for a in ("request", "response", "error", "client_conn", "server_conn"):
-            if getattr(self, a, False):
-                s += "\r\n  %s = {flow.%s}" % (a, a)
-        s += ">"
-        return s.format(flow=self)
+            v = getattr(self, a, None)
+            if v:
+                parts.append("\r\n  %s = %r" % (a, v))
+        parts.append(">")
+        return "".join(parts)
 
     def copy(self):
         f = super().copy()
@@ -186,7 +212,7 @@ class HTTPFlow(flow.Flow):
             f.response = self.response.copy()
         return f
 
-    def replace(self, pattern, repl, *args, **kwargs):
+    def replace(self, pattern, repl, flags=0, count=0):
         """
             Replaces a regular expression pattern with repl in both request and
             response of the flow. Encoded content will be decoded before
@@ -194,31 +220,64 @@ class HTTPFlow(flow.Flow):
 
             Returns the number of replacements made.
         """
-        c = self.request.replace(pattern, repl, *args, **kwargs)
+        # Compile the pattern once up front - request and response would
+        # otherwise each compile it again for headers, body and path.
+        if isinstance(pattern, str):
+            pattern = strutils.escaped_str_to_bytes(pattern)
+        if isinstance(pattern, bytes):
+            pattern = strutils.compile_pattern(pattern, flags)
+        c = self.request.replace(pattern, repl, count=count)
         if self.response:
-            c += self.response.replace(pattern, repl, *args, **kwargs)
+            c += self.response.replace(pattern, repl, count=count)
         return c
 
+    def replace_many(self, replacements, flags=0):
+        """
+            Applies multiple replace()-style substitutions to both request
+            and response in one pass, so each body is only decoded and
+            re-encoded once however many patterns there are.
 
-def make_error_response(status_code, message, headers=None):
-    response = http.status_codes.RESPONSES.get(status_code, "Unknown")
-    body = """
+            Args:
+                replacements: An iterable of (pattern, repl) pairs.
+
+            Returns the total number of replacements made.
+        """
+        # Compile the pairs once up front - this also makes sure a
+        # generator argument reaches both request and response.
+        replacements = http.message._compile_replacements(replacements, flags)
+        c = self.request.replace_many(replacements)
+        if self.response:
+            c += self.response.replace_many(replacements)
+        return c
+
+
+_error_response_body = """
         <html>
             <head>
                 <title>%d %s</title>
             </head>
             <body>%s</body>
         </html>
-    """.strip() % (status_code, response, cgi.escape(message))
+    """.strip()
+
+# Everything except Content-Length is the same for every error response,
+# so keep a prototype around and copy it instead of re-folding the header
+# names on every call.
+_error_response_headers = http.Headers(
+    Server=version.MITMPROXY,
+    Connection="close",
+    Content_Type="text/html"
+)
+
+
+def make_error_response(status_code, message, headers=None):
+    response = http.status_codes.RESPONSES.get(status_code, "Unknown")
+    body = _error_response_body % (status_code, response, cgi.escape(message))
     body = body.encode("utf8", "replace")
 
     if not headers:
-        headers = http.Headers(
-            Server=version.MITMPROXY,
-            Connection="close",
-            Content_Length=str(len(body)),
-            Content_Type="text/html"
-        )
+        headers = _error_response_headers.copy()
+        headers["Content-Length"] = str(len(body))
 
     return HTTPResponse(
         b"HTTP/1.1",
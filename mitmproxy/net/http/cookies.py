@@ -1,9 +1,9 @@
 import collections
-import email.utils
 import re
 import time
 
 from mitmproxy.types import multidict
+from mitmproxy.utils import dates
 
 """
 A flexible module for cookie parsing and manipulation.
@@ -297,10 +297,9 @@ def refresh_set_cookie_header(c, delta):
         raise ValueError("Invalid Cookie")
 
     if "expires" in attrs:
-        e = email.utils.parsedate_tz(attrs["expires"])
-        if e:
-            f = email.utils.mktime_tz(e) + delta
-            attrs.set_all("expires", [email.utils.formatdate(f)])
+        refreshed = dates.shift_date(attrs["expires"], delta)
+        if refreshed is not None:
+            attrs.set_all("expires", [refreshed])
         else:
             # This can happen when the expires tag is invalid.
             # reddit.com sends a an expires tag like this: "Thu, 31 Dec
@@ -326,9 +325,9 @@ def get_expiration_ts(cookie_attrs):
                  None, if no expiration time is set.
     """
     if 'expires' in cookie_attrs:
-        e = email.utils.parsedate_tz(cookie_attrs["expires"])
-        if e:
-            return email.utils.mktime_tz(e)
+        ts = dates.parse_date_ts(cookie_attrs["expires"])
+        if ts is not None:
+            return ts
 
     elif 'max-age' in cookie_attrs:
         try:
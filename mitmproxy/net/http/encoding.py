@@ -4,11 +4,10 @@ Utility functions for decoding response bodies.
 
 import codecs
 import collections
-from io import BytesIO
 
-import gzip
 import zlib
 import brotli
+import deflate
 
 from typing import Union
 
@@ -114,17 +113,54 @@ def identity(content):
     return content
 
 
+# libdeflate materializes the whole decompressed buffer at once, which is
+# the fast choice for typical web responses but spikes peak memory on huge
+# bodies. Above this (compressed) size we stream through zlib instead.
+LIBDEFLATE_MAX_BYTES = 8 * 1024 * 1024
+
+
+def _decode_gzip_stream(content):
+    buf = bytearray()
+    while True:
+        d = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        for i in range(0, len(content), 65536):
+            buf += d.decompress(content[i:i + 65536])
+        buf += d.flush()
+        if not d.eof:
+            raise zlib.error("incomplete gzip stream")
+        # A gzip body may (rarely) concatenate multiple members.
+        content = d.unused_data
+        if not content:
+            return bytes(buf)
+
+
 def decode_gzip(content):
-    gfile = gzip.GzipFile(fileobj=BytesIO(content))
-    return gfile.read()
+    # libdeflate is considerably faster than stdlib zlib for the
+    # all-at-once decompression we do here (bodies are complete
+    # in-memory buffers, never streams). It hands back bytearrays,
+    # which we convert as the rest of the code expects bytes.
+    if len(content) > LIBDEFLATE_MAX_BYTES:
+        return _decode_gzip_stream(content)
+    try:
+        decoded = bytes(deflate.gzip_decompress(content))
+    except deflate.DeflateError:
+        # libdeflate sizes its output buffer from the last member's ISIZE
+        # trailer, so a (rare but legal) multi-member stream usually fails
+        # right here. The streaming path handles those.
+        return _decode_gzip_stream(content)
+    # If the stream trailer does not match what we decoded, this is a
+    # multi-member stream whose members happened to fit the buffer -
+    # libdeflate stops after the first member, zlib streaming picks up
+    # the rest.
+    isize = int.from_bytes(content[-4:], "little")
+    crc = int.from_bytes(content[-8:-4], "little")
+    if len(decoded) & 0xffffffff != isize or zlib.crc32(decoded) != crc:
+        return _decode_gzip_stream(content)
+    return decoded
 
 
 def encode_gzip(content):
-    s = BytesIO()
-    gf = gzip.GzipFile(fileobj=s, mode='wb')
-    gf.write(content)
-    gf.close()
-    return s.getvalue()
+    return bytes(deflate.gzip_compress(content))
 
 
 def decode_brotli(content):
@@ -154,7 +190,7 @@ def encode_deflate(content):
     """
         Returns compressed content, always including zlib header and checksum.
     """
-    return zlib.compress(content)
+    return bytes(deflate.zlib_compress(content))
 
 
 custom_decode = {
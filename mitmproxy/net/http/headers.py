@@ -1,5 +1,3 @@
-import re
-
 import collections
 from mitmproxy.types import multidict
 from mitmproxy.utils import strutils
@@ -150,7 +148,8 @@ class Headers(multidict.MultiDict):
     def replace(self, pattern, repl, flags=0, count=0):
         """
         Replaces a regular expression pattern with repl in each "name: value"
-        header line.
+        header line. Also accepts a pre-compiled pattern, in which case
+        flags is ignored.
 
         Returns:
             The number of replacements made.
@@ -159,7 +158,8 @@ class Headers(multidict.MultiDict):
             pattern = strutils.escaped_str_to_bytes(pattern)
         if isinstance(repl, str):
             repl = strutils.escaped_str_to_bytes(repl)
-        pattern = re.compile(pattern, flags)
+        if isinstance(pattern, bytes):
+            pattern = strutils.compile_pattern(pattern, flags)
         replacements = 0
         flag_count = count > 0
         fields = []
@@ -1,4 +1,4 @@
-import re
+import copy
 from typing import Optional
 
 from mitmproxy.utils import strutils
@@ -16,10 +16,32 @@ def _always_bytes(x):
     return strutils.always_bytes(x, "utf-8", "surrogateescape")
 
 
+def _compile_replacements(replacements, flags):
+    """
+        Normalize an iterable of (pattern, repl) pairs for replace_many:
+        escaped strings become bytes, bytes patterns get compiled.
+        Already-compiled patterns pass through unchanged.
+    """
+    compiled = []
+    for pattern, repl in replacements:
+        if isinstance(pattern, str):
+            pattern = strutils.escaped_str_to_bytes(pattern)
+        if isinstance(repl, str):
+            repl = strutils.escaped_str_to_bytes(repl)
+        if isinstance(pattern, bytes):
+            pattern = strutils.compile_pattern(pattern, flags)
+        compiled.append((pattern, repl))
+    return compiled
+
+
 class MessageData(serializable.Serializable):
+    # With one instance per captured message, the per-instance dict is
+    # pure overhead - subclasses declare their fields as __slots__.
+    __slots__ = ()
+
     def __eq__(self, other):
         if isinstance(other, MessageData):
-            return self.__dict__ == other.__dict__
+            return self.get_state() == other.get_state()
         return False
 
     def __ne__(self, other):
@@ -32,14 +54,17 @@ class MessageData(serializable.Serializable):
             setattr(self, k, v)
 
     def get_state(self):
-        state = vars(self).copy()
+        state = {a: getattr(self, a) for a in self.__slots__}
         state["headers"] = state["headers"].get_state()
         return state
 
     @classmethod
     def from_state(cls, state):
-        state["headers"] = headers.Headers.from_state(state["headers"])
-        return cls(**state)
+        # State data is already in canonical form, so skip the
+        # constructor and its type conversions.
+        d = cls.__new__(cls)
+        d.set_state(state)
+        return d
 
 
 class Message(serializable.Serializable):
@@ -62,6 +87,15 @@ class Message(serializable.Serializable):
         state["headers"] = headers.Headers.from_state(state["headers"])
         return cls(**state)
 
+    def copy(self):
+        # Much cheaper than the default state round-trip in
+        # Serializable.copy: body and timestamps are immutable and can be
+        # shared, only the data container and the headers must be fresh.
+        message = copy.copy(self)
+        message.data = copy.copy(self.data)
+        message.headers = self.headers.copy()
+        return message
+
     @property
     def headers(self):
         """
@@ -121,7 +155,11 @@ class Message(serializable.Serializable):
                 "Please use .text if you want to assign a str."
                 .format(type(value).__name__)
             )
-        ce = self.headers.get("content-encoding")
+        self._set_content(value, self.headers.get("content-encoding"))
+
+    def _set_content(self, value: bytes, ce):
+        # Like set_content, but with an already-resolved content-encoding
+        # so that callers which just set the header don't scan it again.
         try:
             self.raw_content = encoding.encode(value, ce or "identity")
         except ValueError:
@@ -243,17 +281,52 @@ class Message(serializable.Serializable):
         Raises:
             ValueError, when the specified content-encoding is invalid.
         """
+        if isinstance(e, bytes):
+            e = _native(e)
         self.headers["content-encoding"] = e
-        self.content = self.raw_content
+        if self.raw_content is not None:
+            # We just set the content-encoding header ourselves,
+            # no need to look it up again.
+            self._set_content(self.raw_content, e)
         if "content-encoding" not in self.headers:
             raise ValueError("Invalid content encoding {}".format(repr(e)))
 
+    def replace_many(self, replacements, flags=0):
+        """
+        Applies multiple replace()-style substitutions in one go. An encoded
+        body is decoded and re-encoded only once for all patterns, instead
+        of once per pattern.
+
+        Args:
+            replacements: An iterable of (pattern, repl) pairs.
+
+        Returns:
+            The total number of replacements made.
+        """
+        compiled = _compile_replacements(replacements, flags)
+        count = 0
+        if self.content:
+            content = self.content
+            changed = False
+            for pattern, repl in compiled:
+                if pattern.search(content):
+                    content, n = pattern.subn(repl, content)
+                    count += n
+                    changed = True
+            if changed:
+                self.content = content
+        for pattern, repl in compiled:
+            count += self.headers.replace(pattern, repl)
+        return count
+
     def replace(self, pattern, repl, flags=0, count=0):
         """
         Replaces a regular expression pattern with repl in both the headers
         and the body of the message. Encoded body will be decoded
         before replacement, and re-encoded afterwards.
 
+        Also accepts a pre-compiled pattern, in which case flags is ignored.
+
         Returns:
             The number of replacements made.
         """
@@ -261,10 +334,17 @@ class Message(serializable.Serializable):
             pattern = strutils.escaped_str_to_bytes(pattern)
         if isinstance(repl, str):
             repl = strutils.escaped_str_to_bytes(repl)
+        if isinstance(pattern, bytes):
+            pattern = strutils.compile_pattern(pattern, flags)
         replacements = 0
         if self.content:
-            self.content, replacements = re.subn(
-                pattern, repl, self.content, flags=flags, count=count
-            )
-        replacements += self.headers.replace(pattern, repl, flags=flags, count=count)
+            content = self.content
+            # Only write back (and re-encode) when there is a match -
+            # an untouched body does not need a fresh copy.
+            if pattern.search(content):
+                content, replacements = pattern.subn(
+                    repl, content, count=count
+                )
+                self.content = content
+        replacements += self.headers.replace(pattern, repl, count=count)
         return replacements
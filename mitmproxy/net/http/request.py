@@ -1,4 +1,5 @@
 import re
+import sys
 import urllib
 
 from mitmproxy.types import multidict
@@ -14,8 +15,25 @@ import mitmproxy.net.http.url
 # https://bugzilla.mozilla.org/show_bug.cgi?id=45891
 host_header_re = re.compile(r"^(?P<host>[^:]+|\[.+\])(?::(?P<port>\d+))?$")
 
+# Virtually every request draws its method and scheme from these small
+# fixed sets. Store one shared object per value instead of a fresh copy
+# per request - with many captured flows this adds up.
+_canonical_methods = {
+    m: m for m in (
+        b"GET", b"POST", b"HEAD", b"PUT", b"DELETE",
+        b"OPTIONS", b"CONNECT", b"TRACE", b"PATCH",
+    )
+}
+_canonical_schemes = {s: s for s in (b"http", b"https")}
+
 
 class RequestData(message.MessageData):
+    __slots__ = (
+        "first_line_format", "method", "scheme", "host", "port", "path",
+        "http_version", "headers", "content",
+        "timestamp_start", "timestamp_end",
+    )
+
     def __init__(
         self,
         first_line_format,
@@ -45,9 +63,12 @@ class RequestData(message.MessageData):
         if isinstance(content, str):
             raise ValueError("Content must be bytes, not {}".format(type(content).__name__))
 
+        if isinstance(first_line_format, str):
+            first_line_format = sys.intern(first_line_format)
+
         self.first_line_format = first_line_format
-        self.method = method
-        self.scheme = scheme
+        self.method = _canonical_methods.get(method, method)
+        self.scheme = _canonical_schemes.get(scheme, scheme)
         self.host = host
         self.port = port
         self.path = path
@@ -66,6 +87,12 @@ class Request(message.Message):
         super().__init__()
         self.data = RequestData(*args, **kwargs)
 
+    @classmethod
+    def from_state(cls, state):
+        f = cls.__new__(cls)
+        f.data = RequestData.from_state(state)
+        return f
+
     def __repr__(self):
         if self.host and self.port:
             hostport = "{}:{}".format(self.host, self.port)
@@ -76,12 +103,28 @@ class Request(message.Message):
             self.method, hostport, path
         )
 
+    def replace_many(self, replacements, flags=0):
+        """
+            Like :py:meth:`Message.replace_many`, but additionally applies
+            all substitutions to the request path.
+        """
+        compiled = message._compile_replacements(replacements, flags)
+        c = super().replace_many(compiled)
+        path = self.data.path
+        for pattern, repl in compiled:
+            path, pc = pattern.subn(repl, path)
+            c += pc
+        self.path = path
+        return c
+
     def replace(self, pattern, repl, flags=0, count=0):
         """
             Replaces a regular expression pattern with repl in the headers, the
             request path and the body of the request. Encoded content will be
             decoded before replacement, and re-encoded afterwards.
 
+            Also accepts a pre-compiled pattern, in which case flags is ignored.
+
             Returns:
                 The number of replacements made.
         """
@@ -89,10 +132,12 @@ class Request(message.Message):
             pattern = strutils.escaped_str_to_bytes(pattern)
         if isinstance(repl, str):
             repl = strutils.escaped_str_to_bytes(repl)
+        if isinstance(pattern, bytes):
+            pattern = strutils.compile_pattern(pattern, flags)
 
-        c = super().replace(pattern, repl, flags, count)
-        self.path, pc = re.subn(
-            pattern, repl, self.data.path, flags=flags, count=count
+        c = super().replace(pattern, repl, count=count)
+        self.path, pc = pattern.subn(
+            repl, self.data.path, count=count
         )
         c += pc
         return c
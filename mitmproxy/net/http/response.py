@@ -1,5 +1,5 @@
 import time
-from email.utils import parsedate_tz, formatdate, mktime_tz
+from mitmproxy.utils import dates
 from mitmproxy.utils import human
 from mitmproxy.types import multidict
 from mitmproxy.net.http import cookies
@@ -13,7 +13,19 @@ from typing import Tuple
 from typing import Union
 
 
+def _refresh_cookie(header, delta):
+    try:
+        return cookies.refresh_set_cookie_header(header, delta)
+    except ValueError:
+        return header
+
+
 class ResponseData(message.MessageData):
+    __slots__ = (
+        "http_version", "status_code", "reason", "headers", "content",
+        "timestamp_start", "timestamp_end",
+    )
+
     def __init__(
         self,
         http_version,
@@ -50,6 +62,12 @@ class Response(message.Message):
         super().__init__()
         self.data = ResponseData(*args, **kwargs)
 
+    @classmethod
+    def from_state(cls, state):
+        f = cls.__new__(cls)
+        f.data = ResponseData.from_state(state)
+        return f
+
     def __repr__(self):
         if self.raw_content:
             details = "{}, {}".format(
@@ -159,6 +177,14 @@ class Response(message.Message):
     def cookies(self, value):
         self._set_cookies(value)
 
+    # All the headers refresh() needs to touch, lowercased.
+    _refresh_header_names = frozenset([
+        b"date",
+        b"expires",
+        b"last-modified",
+        b"set-cookie",
+    ])
+
     def refresh(self, now=None):
         """
         This fairly complex and heuristic function refreshes a server
@@ -167,6 +193,13 @@ class Response(message.Message):
             - It adjusts date, expires and last-modified headers.
             - It adjusts cookie expiration.
         """
+        # One pass over the raw fields to see if there is anything to do at
+        # all - most replayed responses have none of the relevant headers.
+        for name, _ in self.headers.fields:
+            if name.lower() in self._refresh_header_names:
+                break
+        else:
+            return
         if not now:
             now = time.time()
         delta = now - self.timestamp_start
@@ -177,16 +210,12 @@ class Response(message.Message):
         ]
         for i in refresh_headers:
             if i in self.headers:
-                d = parsedate_tz(self.headers[i])
-                if d:
-                    new = mktime_tz(d) + delta
-                    self.headers[i] = formatdate(new)
-        c = []
-        for set_cookie_header in self.headers.get_all("set-cookie"):
-            try:
-                refreshed = cookies.refresh_set_cookie_header(set_cookie_header, delta)
-            except ValueError:
-                refreshed = set_cookie_header
-            c.append(refreshed)
-        if c:
-            self.headers.set_all("set-cookie", c)
+                shifted = dates.shift_date(self.headers[i], delta)
+                if shifted is not None:
+                    self.headers[i] = shifted
+        set_cookie_headers = self.headers.get_all("set-cookie")
+        if set_cookie_headers:
+            self.headers.set_all("set-cookie", [
+                _refresh_cookie(header, delta)
+                for header in set_cookie_headers
+            ])
@@ -70,6 +70,22 @@ class _MultiDict(MutableMapping, serializable.Serializable, metaclass=ABCMeta):
     def __ne__(self, other):
         return not self.__eq__(other)
 
+    def _kconv_fields(self):
+        """
+        The fields with canonicalized keys. Computed lazily and cached:
+        lookups vastly outnumber mutations (which replace the fields tuple
+        wholesale, invalidating the cache by identity).
+        """
+        fields = self.fields
+        cached = self.__dict__.get("_kconv_cache")
+        if cached is None or cached[0] is not fields:
+            cached = (
+                fields,
+                tuple((self._kconv(k), v) for k, v in fields)
+            )
+            self.__dict__["_kconv_cache"] = cached
+        return cached[1]
+
     def get_all(self, key):
         """
         Return the list of all values for a given key.
@@ -78,8 +94,8 @@ class _MultiDict(MutableMapping, serializable.Serializable, metaclass=ABCMeta):
         key = self._kconv(key)
         return [
             value
-            for k, value in self.fields
-            if self._kconv(k) == key
+            for k, value in self._kconv_fields()
+            if k == key
         ]
 
     def set_all(self, key, values):
@@ -5,6 +5,8 @@ class Serializable(metaclass=abc.ABCMeta):
     """
     Abstract Base Class that defines an API to save an object's state and restore it later on.
     """
+    # No state of its own - this allows subclasses to opt into __slots__.
+    __slots__ = ()
 
     @classmethod
     @abc.abstractmethod
@@ -0,0 +1,33 @@
+import functools
+
+# email.utils drags in a sizeable chunk of the email package, which only
+# replay and cookie-expiry handling ever need. Import it on first use so
+# that merely proxying flows does not pay the import time and memory.
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_date_ts(value):
+    """
+        Parse an RFC 2822/1123 date string, as used in HTTP headers and
+        cookie expires attributes, to a unix timestamp. Returns None if the
+        value cannot be parsed. The parsing in email.utils is pure Python
+        and the same strings come around many times during replay, so
+        results are cached.
+    """
+    import email.utils
+    d = email.utils.parsedate_tz(value)
+    if d is None:
+        return None
+    return email.utils.mktime_tz(d)
+
+
+def shift_date(value, delta):
+    """
+        Shift an RFC 2822/1123 date string by delta seconds. Returns the
+        shifted date string, or None if the value cannot be parsed.
+    """
+    import email.utils
+    ts = parse_date_ts(value)
+    if ts is None:
+        return None
+    return email.utils.formatdate(ts + delta)
@@ -66,6 +66,7 @@ setup(
         "construct>=2.5.2, <2.6",
         "cryptography>=1.3, <1.6",
         "cssutils>=1.0.1, <1.1",
+        "deflate>=0.6",
         "Flask>=0.10.1, <0.12",
         "h2>=2.5.0, <3",
         "html2text>=2016.1.8, <=2016.9.19",
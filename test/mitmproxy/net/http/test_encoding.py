@@ -1,3 +1,5 @@
+import gzip
+
 import mock
 import pytest
 
@@ -44,6 +46,17 @@ def test_encoders(encoder):
         encoding.decode(b"foobar", encoder)
 
 
+def test_gzip_multi_member():
+    # Multiple gzip members in one body are rare but legal, and must
+    # decode to the concatenation - whether member sizes differ or not.
+    assert encoding.decode(
+        gzip.compress(b"hello ") + gzip.compress(b"world"), "gzip"
+    ) == b"hello world"
+    assert encoding.decode(
+        gzip.compress(b"aaa") + gzip.compress(b"bbb"), "gzip"
+    ) == b"aaabbb"
+
+
 def test_cache():
     decode_gzip = mock.MagicMock()
     decode_gzip.return_value = b"decoded"
@@ -106,6 +106,21 @@ class TestMessage:
         r.replace(b"foo", "gg", count=1)
         assert r.content == b"ggfootoo"
 
+    def test_replace_many(self):
+        r = tutils.tresp()
+        r.headers["foo"] = "foo"
+        r.content = b"foobar"
+        assert r.replace_many([(b"foo", b"x"), (b"bar", b"y")]) == 4
+        assert r.content == b"xy"
+        assert r.headers["x"] == "x"
+
+        r = tutils.tresp()
+        r.content = b"foobar"
+        r.encode("gzip")
+        assert r.replace_many([(b"foo", b"x"), (b"nothing", b"y")]) == 1
+        r.decode()
+        assert r.raw_content == b"xbar"
+
 
 class TestMessageContentEncoding:
     def test_simple(self):
@@ -139,6 +139,31 @@ class TestHTTPFlow:
         assert f.response.headers["bar"] == "bar"
         assert f.response.content == b"abarb"
 
+    def test_replace_many(self):
+        f = tflow.tflow(resp=True)
+        f.request.path = "/foo"
+        f.request.content = b"afoob"
+        f.response.headers["foo"] = "foo"
+        f.response.content = b"afoob"
+
+        assert f.replace_many([("foo", "bar"), ("aba", "c")]) == 7
+
+        assert f.request.path == "/bar"
+        assert f.request.content == b"crb"
+        assert f.response.headers["bar"] == "bar"
+        assert f.response.content == b"crb"
+
+    def test_replace_many_generator(self):
+        # A generator argument must reach both request and response.
+        f = tflow.tflow(resp=True)
+        f.request.content = b"afoob"
+        f.response.content = b"afoob"
+
+        assert f.replace_many((p, r) for p, r in [("foo", "bar")]) == 2
+
+        assert f.request.content == b"abarb"
+        assert f.response.content == b"abarb"
+
     def test_replace_encoded(self):
         f = tflow.tflow(resp=True)
         f.request.content = b"afoob"
@@ -0,0 +1,12 @@
+from mitmproxy.utils import dates
+
+
+def test_parse_date_ts():
+    assert dates.parse_date_ts("Mon, 01 Jan 2018 00:00:00 GMT") == 1514764800
+    assert dates.parse_date_ts("not a date") is None
+
+
+def test_shift_date():
+    shifted = dates.shift_date("Mon, 01 Jan 2018 00:00:00 GMT", 3600)
+    assert dates.parse_date_ts(shifted) == 1514764800 + 3600
+    assert dates.shift_date("not a date", 3600) is None
@@ -1,7 +1,28 @@
+import re
+
 from mitmproxy.utils import strutils
 from mitmproxy.test import tutils
 
 
+def test_compile_pattern():
+    # literal patterns get the bytes fast path
+    p = strutils.compile_pattern(b"foo.bar")
+    assert not isinstance(p, strutils._LiteralPattern)
+    p = strutils.compile_pattern(b"foobar")
+    assert isinstance(p, strutils._LiteralPattern)
+    assert p.search(b"xfoobarx")
+    assert not p.search(b"xyz")
+    assert p.subn(b"baz", b"foobar foobar") == (b"baz baz", 2)
+    assert p.subn(b"baz", b"foobar foobar", count=1) == (b"baz foobar", 1)
+    assert p.subn(b"baz", b"nothing here") == (b"nothing here", 0)
+    # replacement escapes and callable repls fall back to re
+    assert p.subn(b"\\g<0>!", b"foobar") == (b"foobar!", 1)
+    assert p.subn(lambda m: m.group(0).upper(), b"foobar") == (b"FOOBAR", 1)
+    # flags force the regex engine
+    p = strutils.compile_pattern(b"foobar", re.IGNORECASE)
+    assert p.subn(b"baz", b"FOOBAR") == (b"baz", 1)
+
+
 def test_always_bytes():
     assert strutils.always_bytes(bytes(range(256))) == bytes(range(256))
     assert strutils.always_bytes("foo") == b"foo"